@@ -1,5 +1,5 @@
 ﻿from __future__ import annotations
-import os, json
+import os, sys, json
 from datetime import datetime
 from pathlib import Path
 
@@ -8,11 +8,14 @@ from io_utils.logger import get_logger, info
 from nestor.dialogue.session import (
     SessionState,
     build_prompt,
-    maybe_call_llm,
+    stream_llm,
     load_corpus_from_config,
     select_item,
 )
 
+# nombre de tours entre deux flush du JSONL de session
+_FLUSH_EVERY = 8
+
 def _ensure_parent(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -39,44 +42,56 @@ def main():
     print("• Entrez un thème pour une blague à la demande")
     print("• Commandes: :compact (toggle 2 phrases max), :help, :q\n")
 
-    while True:
-        raw = input("Thème (ENTER aléatoire, :q quitter): ").strip()
+    # fichier d'historique ouvert une seule fois (fermé/flushé en sortie)
+    f = out_path.open("a", encoding="utf-8", buffering=1 << 16)
+    turns = 0
+    try:
+        while True:
+            raw = input("Thème (ENTER aléatoire, :q quitter): ").strip()
 
-        if raw == "":
-            item = select_item(items)
-        elif raw.startswith(":"):
-            cmd = raw.lower()
-            if cmd in {":q", ":quit", ":exit"}:
-                print(f"\nHistorique → {out_path.as_posix()}\nÀ bientôt! 👋")
-                break
-            if cmd == ":help":
-                print("Commandes: :compact (toggle), :q (quitter)")
-                continue
-            if cmd == ":compact":
-                compact = not compact
-                print(f"Mode compact = {'ON (2 phrases max)' if compact else 'OFF'}")
+            if raw == "":
+                item = select_item(items)
+            elif raw.startswith(":"):
+                cmd = raw.lower()
+                if cmd in {":q", ":quit", ":exit"}:
+                    print(f"\nHistorique → {out_path.as_posix()}\nÀ bientôt! 👋")
+                    break
+                if cmd == ":help":
+                    print("Commandes: :compact (toggle), :q (quitter)")
+                    continue
+                if cmd == ":compact":
+                    compact = not compact
+                    print(f"Mode compact = {'ON (2 phrases max)' if compact else 'OFF'}")
+                    continue
+                print("Commande inconnue. Essayez :help")
                 continue
-            print("Commande inconnue. Essayez :help")
-            continue
-        else:
-            # thème guidé par l’utilisateur
-            item = {"setup": raw, "tags": ["user"]}
-
-        # prompt
-        prompt = build_prompt(item, state)
-        if compact:
-            prompt += "\nRéponds en 2 phrases maximum."
+            else:
+                # thème guidé par l’utilisateur
+                item = {"setup": raw, "tags": ["user"]}
 
-        # génération
-        text = maybe_call_llm(prompt, cfg)
-        state.history.append({"prompt": prompt, "output": text})
+            # prompt
+            prompt = build_prompt(item, state)
+            if compact:
+                prompt += "\nRéponds en 2 phrases maximum."
 
-        # affichage
-        print("\n--- Nestor ---\n" + text + "\n")
+            # génération en streaming, affichée au fil de l'eau
+            print("\n--- Nestor ---")
+            parts = []
+            for piece in stream_llm(prompt, cfg):
+                parts.append(piece)
+                sys.stdout.write(piece)
+                sys.stdout.flush()
+            print("\n")
+            text = "".join(parts)
+            state.history.append({"prompt": prompt, "output": text})
 
-        # sauvegarde incrémentale (JSONL)
-        with out_path.open("a", encoding="utf-8") as f:
+            # sauvegarde incrémentale (JSONL), flush groupé tous les N tours
             f.write(json.dumps({"prompt": prompt, "output": text}, ensure_ascii=False) + "\n")
+            turns += 1
+            if turns % _FLUSH_EVERY == 0:
+                f.flush()
+    finally:
+        f.close()
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,46 @@
-﻿import json
+﻿import os, json, mmap
 from pathlib import Path
 
+try:
+    # parseur C optionnel, repli sur json (stdlib) s'il n'est pas installé
+    import orjson
+except ImportError:
+    orjson = None
+
+_BOM = b"\xef\xbb\xbf"
+# en dessous, un read() simple est plus rapide que mmap (configs, petits corpus)
+_MMAP_MIN_SIZE = 1 << 20
+
+def loads_bytes(data: bytes):
+    # BOM éventuel retiré une fois, avant le parse
+    if data.startswith(_BOM):
+        data = data[len(_BOM):]
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps_bytes(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 def load_json(path: str):
-    p = Path(path)
-    # utf-8-sig enlève le BOM si présent
-    with p.open("r", encoding="utf-8-sig") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        if orjson is None or os.fstat(f.fileno()).st_size <= _MMAP_MIN_SIZE:
+            return loads_bytes(f.read())
+        # gros fichier: orjson lit directement la page mappée, sans copie
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = len(_BOM) if mm[:len(_BOM)] == _BOM else 0
+            with memoryview(mm)[start:] as view:
+                return orjson.loads(view)
+
+def load_jsonl(path: str):
+    data = Path(path).read_bytes()
+    if data.startswith(_BOM):
+        data = data[len(_BOM):]
+    # BOM retiré une fois pour tout le fichier: parse direct ligne à ligne
+    parse = orjson.loads if orjson is not None else json.loads
+    return [parse(line) for line in data.splitlines() if line.strip()]
 
 def save_json(path: str, data):
     p = Path(path)
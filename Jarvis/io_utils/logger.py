@@ -1,32 +1,116 @@
 from __future__ import annotations
-import os, sys, json, threading, datetime
+import os, sys, json, threading, time, atexit
+from collections import deque
 from typing import Optional
 
 _LEVELS = {"DEBUG":10, "INFO":20, "WARN":30, "ERROR":40}
 _lock = threading.Lock()
 _singleton = None
 
+# écriture groupée: flush toutes les _FLUSH_INTERVAL s, ou dès que _BATCH lignes attendent
+_BATCH = 64
+_FLUSH_INTERVAL = 0.05
+
 class Logger:
     def __init__(self, path: str="logs/logs.txt", level: str="INFO", echo: bool=True):
         self.path = path
         self.level = _LEVELS.get(level.upper(), 20)
         self.echo = echo
         os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # horodatage formaté une fois par seconde: (seconde, texte)
+        self._ts_cache = (0, "")
+        # fd brut ouvert une fois (O_APPEND); les lignes déjà encodées en UTF-8
+        # passent par une file vidée en tâche de fond
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._queue: deque[bytes] = deque()
+        self._wake = threading.Event()    # réveil anticipé quand _BATCH lignes attendent
+        self._stop = threading.Event()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._drain, name="logger-drain", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _flush_locked(self, extra: bytes = b"") -> None:
+        # appelé sous _lock: vide la file (dans l'ordre) puis écrit `extra`
+        batches = []
+        while self._queue:
+            batch = []
+            while self._queue and len(batch) < _BATCH:
+                batch.append(self._queue.popleft())
+            batches.append(b"".join(batch))
+        if extra:
+            batches.append(extra)
+        if not batches:
+            return
+        if self._fd is None:
+            # après close(): écriture directe, fichier rouvert le temps de la ligne
+            with open(self.path, "ab") as f:
+                f.writelines(batches)
+            return
+        for buf in batches:
+            self._write(buf)
+
+    def _write(self, buf: bytes) -> None:
+        view = memoryview(buf)
+        while view:
+            view = view[os.write(self._fd, view):]
+
+    def _drain(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(_FLUSH_INTERVAL)
+            self._wake.clear()
+            if self._queue:
+                with _lock:
+                    self._flush_locked()
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        # marqué fermé AVANT le dernier flush: une ligne ajoutée ensuite est
+        # soit vidée ici, soit écrite directement par log()
+        self._closed.set()
+        with _lock:
+            # deux close() concurrents (explicite + atexit) passent le test ci-dessus:
+            # seul le premier à prendre le verrou ferme le fd
+            if self._fd is None:
+                return
+            self._flush_locked()
+            os.close(self._fd)
+            self._fd = None
+
+    def _timestamp(self) -> str:
+        sec = int(time.time())
+        cached_sec, ts = self._ts_cache
+        if sec != cached_sec:
+            ts = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec))
+            self._ts_cache = (sec, ts)
+        return ts
 
     def log(self, message: str, level: str="INFO", ctx: Optional[dict]=None):
         lvl = _LEVELS.get(level.upper(), 20)
         if lvl < self.level:
             return
-        ts = datetime.datetime.now().isoformat(timespec="seconds")
-        line = f"{ts} [{level.upper():5}] {message}"
+        line = "%s [%-5s] %s" % (self._timestamp(), level.upper(), message)
         if ctx:
             try:
                 line += " | " + json.dumps(ctx, ensure_ascii=False, separators=(",",":"))
             except Exception:
                 pass
-        with _lock:
-            with open(self.path, "a", encoding="utf-8") as f:
-                f.write(line + "\n")
+        buf = (line + "\n").encode("utf-8")
+        if lvl >= 30:
+            # WARN/ERROR: écrits tout de suite (après la file, pour garder l'ordre)
+            with _lock:
+                self._flush_locked(buf)
+        else:
+            self._queue.append(buf)
+            if self._closed.is_set():
+                with _lock:
+                    self._flush_locked()
+            elif len(self._queue) >= _BATCH:
+                self._wake.set()
         if self.echo:
             print(line, file=(sys.stderr if lvl>=30 else sys.stdout))
 
@@ -41,4 +125,4 @@ def get_logger(path: Optional[str]=None, level: str="INFO", echo: bool=True) ->
 def debug(msg, **ctx): get_logger().log(msg, "DEBUG", ctx or None)
 def info(msg, **ctx):  get_logger().log(msg, "INFO",  ctx or None)
 def warn(msg, **ctx):  get_logger().log(msg, "WARN",  ctx or None)
-def error(msg, **ctx): get_logger().log(msg, "ERROR", ctx or None)
\ No newline at end of file
+def error(msg, **ctx): get_logger().log(msg, "ERROR", ctx or None)
@@ -1,12 +1,14 @@
 # --- session.py (M3 propre : logger + orchestration légère) ---
 from __future__ import annotations
 
-import os, json, random, traceback
-from typing import Any, Dict, List
+import os, json, random, functools
+from typing import Any, Dict, Iterator, List
 from dataclasses import dataclass, field
 
 from io_utils.config_manager import load_config
+from io_utils.json_loader import load_json, load_jsonl
 from io_utils.logger import get_logger, info, debug, warn, error
+from nestor.llm import client as llm_client
 
 
 # --------------------------
@@ -53,9 +55,11 @@ USE_EMOJI   = bool(style_cfg.get("emoji", True))
 # --------------------------
 # Lecture corpus
 # --------------------------
+# corpus déjà parsés, clé = (chemin, mtime) pour relire si le fichier change
+_CORPUS_CACHE: Dict[tuple, List[Dict[str, Any]]] = {}
+
 def _read_json(path: str) -> List[Dict[str, Any]]:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(path)
     if isinstance(data, dict):
         data = data.get("items", [])
     if not isinstance(data, list):
@@ -63,14 +67,8 @@ def _read_json(path: str) -> List[Dict[str, Any]]:
     return data
 
 def _read_jsonl(path: str) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            items.append(json.loads(line))
-    return items
+    # lecture en bloc + parse natif (orjson si dispo) plutôt que ligne à ligne
+    return load_jsonl(path)
 
 def load_corpus_from_config(cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
     path = cfg.get("data_path") or "toolkit/data/sitcom.jsonl"
@@ -78,10 +76,19 @@ def load_corpus_from_config(cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
         alt = "toolkit/data/sitcom.json"
         warn("Corpus path not found, trying fallback", missing=path, fallback=alt)
         path = alt
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    cached = _CORPUS_CACHE.get(key)
+    if cached is not None:
+        debug("Corpus cache hit", path=path, count=len(cached))
+        return cached
     if path.endswith(".jsonl"):
         items = _read_jsonl(path)
     else:
         items = _read_json(path)
+    # une seule version par chemin: on oublie les mtimes périmés
+    for stale in [k for k in _CORPUS_CACHE if k[0] == key[0]]:
+        del _CORPUS_CACHE[stale]
+    _CORPUS_CACHE[key] = items
     info("Corpus loaded", path=path, count=len(items))
     return items
 
@@ -89,25 +96,42 @@ def load_corpus_from_config(cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
 # --------------------------
 # Prompting
 # --------------------------
+# tirage sans remise: ordre mélangé une fois, reparcouru puis re-mélangé en fin de tour
+_RNG = random.Random()
+_DECK: Dict[str, Any] = {"items": None, "order": [], "pos": 0}
+
 def select_item(items: List[Dict[str, Any]]) -> Dict[str, Any]:
     if not items:
         raise RuntimeError("Corpus vide : impossible de sélectionner un item.")
-    return random.choice(items)
-
-def build_prompt(item: Dict[str, Any], state: SessionState) -> str:
-    setup = item.get("setup") or item.get("text") or ""
-    punch = item.get("punch") or item.get("answer") or ""
-
+    order = _DECK["order"]
+    if _DECK["items"] is not items or len(order) != len(items) or _DECK["pos"] >= len(order):
+        order = list(range(len(items)))
+        _RNG.shuffle(order)
+        _DECK.update(items=items, order=order, pos=0)
+    pos = _DECK["pos"]
+    _DECK["pos"] = pos + 1
+    return items[order[pos]]
+
+@functools.lru_cache(maxsize=32)
+def _prompt_prefix(rating: str, compact: bool, emoji: bool, target_sent: int) -> str:
+    # persona + style: stable pendant une session, assemblé une seule fois
     base = (
         "Tu es Nestor, ado ophanim/cartoon sympa. "
-        f"Rating: {state.rating}. Garde un ton bienveillant et drôle.\n\n"
+        f"Rating: {rating}. Garde un ton bienveillant et drôle.\n\n"
     )
 
     # ✅ Ajouts de style AVANT les retours
-    if COMPACT:
-        base += f"Réponds en {TARGET_SENT} phrases maximum.\n"
-    if not USE_EMOJI:
+    if compact:
+        base += f"Réponds en {target_sent} phrases maximum.\n"
+    if not emoji:
         base += "N'utilise pas d'emojis.\n"
+    return base
+
+def build_prompt(item: Dict[str, Any], state: SessionState) -> str:
+    setup = item.get("setup") or item.get("text") or ""
+    punch = item.get("punch") or item.get("answer") or ""
+
+    base = _prompt_prefix(state.rating, COMPACT, USE_EMOJI, TARGET_SENT)
 
     if setup and punch:
         return base + f"Blague:\nSetup: {setup}\nPunchline: {punch}\n"
@@ -121,10 +145,15 @@ def build_prompt(item: Dict[str, Any], state: SessionState) -> str:
 # --------------------------
 # Appel LLM (vrai appel LM Studio, config globale)
 # --------------------------
+def _debug_tb() -> Dict[str, str]:
+    # la trace complète n'est formatée (et loggée) que si le logger est en DEBUG
+    if get_logger().level > 10:
+        return {}
+    import traceback  # chemin d'erreur uniquement
+    return {"tb": traceback.format_exc()}
+
 def maybe_call_llm(prompt: str, cfg: Dict[str, Any]) -> str:
     try:
-        from nestor.llm import client as llm_client  # import absolu et clair
-
         out = llm_client.generate(
             prompt,
             base_url=BASE_URL,
@@ -141,9 +170,30 @@ def maybe_call_llm(prompt: str, cfg: Dict[str, Any]) -> str:
         return str(out)
 
     except Exception as e:
-        error("LLM call failed; using fallback", err=str(e), tb=traceback.format_exc())
+        error("LLM call failed; using fallback", err=str(e), **_debug_tb())
         return f"(fallback LLM OFF) {prompt}"
 
+def stream_llm(prompt: str, cfg: Dict[str, Any]) -> Iterator[str]:
+    """Variante streaming de maybe_call_llm: produit le texte morceau par morceau."""
+    emitted = False
+    try:
+        for piece in llm_client.generate_stream(
+            prompt,
+            base_url=BASE_URL,
+            model=MODEL,
+            temperature=TEMP,
+            top_p=TOP_P,
+            max_tokens=MAXTOK,
+            system=None,
+        ):
+            emitted = True
+            yield piece
+
+    except Exception as e:
+        error("LLM stream failed; using fallback", err=str(e), **_debug_tb())
+        # même repli que maybe_call_llm, y compris après un flux interrompu
+        yield ("\n" if emitted else "") + f"(fallback LLM OFF) {prompt}"
+
 
 # --------------------------
 # Orchestration
@@ -160,6 +210,7 @@ def run_once(state: SessionState) -> str:
         state.history.append({"prompt": prompt, "output": text})
         return text
     except Exception as e:
+        import traceback
         error("Unhandled exception in run_once", err=str(e), tb=traceback.format_exc())
         raise
 
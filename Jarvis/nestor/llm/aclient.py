@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+
+from io_utils.json_loader import dumps_bytes, loads_bytes
+from .client import _merge_cfg, _build_payload
+
+_HEADERS = {"Content-Type": "application/json"}
+# requêtes simultanées par défaut: une instance LM Studio locale sature vite
+_DEFAULT_LIMIT = 4
+
+def _aiohttp():
+    # dépendance optionnelle: seul le client async en a besoin
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise ImportError(
+            "nestor.llm.aclient nécessite aiohttp (pip install aiohttp)"
+        ) from e
+    return aiohttp
+
+async def agenerate(prompt: str, cfg: dict | None = None, session=None, **kw) -> str:
+    """
+    Version asynchrone de client.generate (même config, même payload).
+    Sans session aiohttp fournie, une session temporaire est ouverte pour l'appel.
+    """
+    aiohttp = _aiohttp()
+    if session is None:
+        async with aiohttp.ClientSession(headers=_HEADERS) as own:
+            return await agenerate(prompt, cfg, session=own, **kw)
+    cfg = _merge_cfg(cfg, **kw)
+    url = cfg["base_url"].rstrip("/") + "/chat/completions"
+    timeout = aiohttp.ClientTimeout(total=60)
+    body = dumps_bytes(_build_payload(prompt, cfg))
+    # en-têtes passés à chaque requête: la session peut venir de l'appelant
+    async with session.post(url, data=body, headers=_HEADERS, timeout=timeout) as r:
+        r.raise_for_status()
+        data = loads_bytes(await r.read())
+    return data["choices"][0]["message"]["content"]
+
+async def agenerate_many(prompts: list[str], cfg: dict | None = None, limit: int = _DEFAULT_LIMIT, **kw) -> list[str]:
+    aiohttp = _aiohttp()
+    # au plus `limit` requêtes en vol pour ne pas surcharger le serveur local
+    sem = asyncio.Semaphore(max(1, limit))
+
+    async def _one(session, prompt: str) -> str:
+        async with sem:
+            return await agenerate(prompt, cfg, session=session, **kw)
+
+    # une seule session (pool de connexions) partagée par tout le lot
+    async with aiohttp.ClientSession(headers=_HEADERS) as session:
+        return list(await asyncio.gather(*[_one(session, p) for p in prompts]))
+
+def generate_many(prompts: list[str], cfg: dict | None = None, limit: int = _DEFAULT_LIMIT, **kw) -> list[str]:
+    """
+    Génère plusieurs réponses en parallèle (au plus `limit` à la fois): le temps
+    total ~ max des latences plutôt que leur somme. Les réponses sont dans
+    l'ordre des prompts.
+    """
+    return asyncio.run(agenerate_many(prompts, cfg, limit=limit, **kw))
@@ -1,4 +1,22 @@
-﻿import requests
+﻿from io_utils.json_loader import dumps_bytes, loads_bytes
+
+# session partagée: connexions TCP gardées ouvertes (keep-alive) entre appels.
+# requests n'est importé qu'au premier appel LLM (démarrage du CLI plus rapide).
+_SESSION = None
+
+def _get_session():
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
 
 def _merge_cfg(cfg: dict | None, **kw):
     cfg = dict(cfg or {})
@@ -11,16 +29,8 @@ def _merge_cfg(cfg: dict | None, **kw):
     cfg.setdefault("max_tokens", 256)
     return cfg
 
-def generate(prompt: str, cfg: dict | None = None, **kw) -> str:
-    """
-    Appel OpenAI-like /chat/completions vers LM Studio.
-    Accepte:
-      - generate(prompt, base_url=..., model=..., ...)
-      - generate(prompt, cfg)
-    """
-    cfg = _merge_cfg(cfg, **kw)
-    url = cfg["base_url"].rstrip("/") + "/chat/completions"
-    payload = {
+def _build_payload(prompt: str, cfg: dict) -> dict:
+    return {
         "model": cfg["model"],
         "messages": (
             ([{"role": "system", "content": cfg.get("system")}]
@@ -31,11 +41,66 @@ def generate(prompt: str, cfg: dict | None = None, **kw) -> str:
         "top_p": cfg["top_p"],
         "max_tokens": cfg["max_tokens"],
     }
-    r = requests.post(url, json=payload, timeout=60)
+
+def generate(prompt: str, cfg: dict | None = None, **kw) -> str:
+    """
+    Appel OpenAI-like /chat/completions vers LM Studio.
+    Accepte:
+      - generate(prompt, base_url=..., model=..., ...)
+      - generate(prompt, cfg)
+    """
+    cfg = _merge_cfg(cfg, **kw)
+    url = cfg["base_url"].rstrip("/") + "/chat/completions"
+    payload = _build_payload(prompt, cfg)
+    # encodage/décodage natif (orjson si dispo), corps envoyé tel quel en bytes
+    r = _get_session().post(url, data=dumps_bytes(payload), timeout=60)
     r.raise_for_status()
-    data = r.json()
+    return _message_content(loads_bytes(r.content))
+
+def _message_content(data: dict) -> str:
     return data["choices"][0]["message"]["content"]
 
+def generate_stream(prompt: str, cfg: dict | None = None, **kw):
+    """
+    Comme generate(), mais en streaming (SSE): produit les morceaux de texte
+    au fil de l'eau au lieu d'attendre la complétion entière.
+    """
+    cfg = _merge_cfg(cfg, **kw)
+    url = cfg["base_url"].rstrip("/") + "/chat/completions"
+    payload = _build_payload(prompt, cfg)
+    payload["stream"] = True
+    with _get_session().post(url, data=dumps_bytes(payload), stream=True, timeout=60) as r:
+        r.raise_for_status()
+        if "text/event-stream" not in r.headers.get("Content-Type", ""):
+            # serveur qui ignore "stream": réponse JSON classique, rendue d'un bloc
+            yield _message_content(loads_bytes(r.content))
+            return
+        seen = False
+        other = []
+        for line in r.iter_lines():
+            if not line.startswith(b"data:"):
+                other.append(line)
+                continue
+            seen = True
+            data = line[5:]
+            if data.startswith(b" "):  # espace après "data:" optionnel (SSE)
+                data = data[1:]
+            if data.strip() == b"[DONE]":
+                break
+            event = loads_bytes(data)
+            if "error" in event:
+                # ex: data: {"error": ...} -> on remonte l'erreur (fallback côté appelant)
+                raise RuntimeError(f"Flux LLM en erreur: {event['error']}")
+            choices = event.get("choices")
+            if not choices:
+                continue  # usage, keep-alive...
+            piece = (choices[0].get("delta") or {}).get("content")
+            if piece:
+                yield piece
+        if not seen:
+            # aucun événement "data:": on tente le corps comme une complétion JSON
+            yield _message_content(loads_bytes(b"\n".join(other)))
+
 # compat héritée: certains anciens codes appellent complete(...)
 def complete(prompt: str, cfg: dict | None = None, **kw) -> str:
     return generate(prompt, cfg, **kw)